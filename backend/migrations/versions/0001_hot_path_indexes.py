@@ -0,0 +1,39 @@
+"""Индексы для часто используемых фильтров
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, схема, таблица, колонки)
+INDEXES = [
+    ("ix_telegram_order_items_order_id", "telegram", "order_items", ["order_id"]),
+    ("ix_app_order_items_order_id", "app", "order_items", ["order_id"]),
+    ("ix_telegram_orders_manager_name", "telegram", "orders", ["manager_name"]),
+    ("ix_app_manual_orders_manager", "app", "manual_orders", ["manager"]),
+    ("ix_telegram_orders_order_status", "telegram", "orders", ["order_status"]),
+    ("ix_app_manual_orders_status", "app", "manual_orders", ["status"]),
+    ("ix_app_products_name_lower", "app", "products", [sa.text("lower(name)")]),
+]
+
+
+def upgrade() -> None:
+    for name, schema, table, columns in INDEXES:
+        op.create_index(name, table, columns, schema=schema, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, schema, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, schema=schema, if_exists=True)
@@ -0,0 +1,55 @@
+from starlette.concurrency import run_in_threadpool
+from dotenv import load_dotenv
+from typing import Any, Callable, Dict, Tuple
+import asyncio
+import os
+import time
+
+
+load_dotenv()
+
+
+# Время жизни закэшированных ответов списков (секунды)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "2"))
+
+
+# Кэш с коротким временем жизни и объединением одинаковых запросов (single-flight):
+# пока значение вычисляется, остальные запросы с тем же ключом ждут его результат
+class SingleFlightCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._generation = 0
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        cached = self._values.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            # Синхронная работа с БД выполняется в пуле потоков, не блокируя цикл событий
+            task = asyncio.ensure_future(run_in_threadpool(compute))
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda t, generation=self._generation: self._store(
+                    key, t, generation)
+            )
+        # shield: отмена одного запроса не отменяет вычисление для остальных
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, task: asyncio.Task, generation: int) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        # Если во время вычисления были изменения, результат не сохраняем
+        if generation == self._generation and self.ttl > 0:
+            self._values[key] = (time.monotonic() + self.ttl, task.result())
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._values.clear()
+        # Новые запросы не должны присоединяться к вычислениям, начатым до изменений
+        self._inflight.clear()
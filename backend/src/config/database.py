@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 import os
 
@@ -8,14 +9,55 @@ load_dotenv()
 
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Необязательная реплика для чтения; если не задана, всё идёт в основную базу
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# Сколько секунд после записи клиент читает из основной базы, пока реплика догоняет
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Cookie, которой помечается клиент, недавно изменявший данные
+PRIMARY_COOKIE = "read_primary"
 
 
 # Создаём движок SQLAlchemy
 engine = create_engine(DATABASE_URL, echo=True)
+read_engine = (
+    create_engine(READ_DATABASE_URL, echo=True) if READ_DATABASE_URL else engine
+)
+
+
+# Сессия, которая отправляет чтение в реплику, а запись — в основную базу
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self._flushing
+            or self.info.get("use_primary")
+            or (clause is not None and clause.is_dml)
+        ):
+            return engine
+        return read_engine
+
+
+# После записи все последующие чтения этой сессии идут в основную базу
+def _remember_write(session):
+    session.info["use_primary"] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    _remember_write(session)
+
+
+# Массовые query(...).delete()/update() выполняются без flush
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    if orm_execute_state.is_delete or orm_execute_state.is_update:
+        _remember_write(orm_execute_state.session)
 
 
 # Создаём фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False
+)
 
 
 # Функция для получения сессии базы данных
@@ -25,3 +67,44 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Читает ли клиент из основной базы после недавней записи
+def reads_from_primary(request: Request) -> bool:
+    return PRIMARY_COOKIE in request.cookies
+
+
+# Функция для получения сессии для чтения (списки, поиск, отчёты)
+def get_read_db(request: Request):
+    db = ReadSessionLocal()
+    db.info["use_primary"] = reads_from_primary(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Выполняет func с отдельной сессией для чтения, не связанной с жизнью запроса
+# (например, для общих вычислений в пуле потоков)
+def run_with_read_session(func, use_primary: bool = False):
+    db = ReadSessionLocal()
+    db.info["use_primary"] = use_primary
+    try:
+        return func(db)
+    finally:
+        db.close()
+
+
+# Сессия для изменяющих эндпоинтов: помечает клиента, чтобы его следующие
+# чтения шли в основную базу (в любом воркере), а не в отстающую реплику
+def get_write_db(response: Response, db: Session = Depends(get_db)):
+    if read_engine is not engine:
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            "1",
+            max_age=REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return db
+
@@ -0,0 +1,85 @@
+from collections import Counter
+from dotenv import load_dotenv
+from typing import Optional
+import os
+import sys
+import threading
+
+
+load_dotenv()
+
+
+PROFILING_INTERVAL_SECONDS = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.005"))
+PROFILING_MAX_WINDOW_SECONDS = float(os.getenv("PROFILING_MAX_WINDOW_SECONDS", "60"))
+
+
+# Каталог с кодом приложения: в профиль попадают только стеки, проходящие через него
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Сэмплирующий профилировщик: фоновый поток периодически снимает стеки всех потоков
+# и считает их в формате folded stacks (flamegraph.pl, speedscope).
+# Если задан root_frame, учитываются только стеки, проходящие через этот кадр
+# (например, кадр middleware отдельного запроса)
+class StackSampler:
+    def __init__(
+        self, interval: float = PROFILING_INTERVAL_SECONDS, root_frame=None
+    ):
+        self.interval = interval
+        self.root_frame = root_frame
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._fold(frame, self.root_frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    @staticmethod
+    def _fold(frame, root_frame=None) -> Optional[str]:
+        frames = []
+        in_app = False
+        in_root = root_frame is None
+        while frame is not None:
+            if frame is root_frame:
+                in_root = True
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.startswith(APP_ROOT):
+                in_app = True
+                filename = os.path.relpath(filename, os.path.dirname(APP_ROOT))
+            else:
+                filename = os.path.basename(filename)
+            frames.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        if not in_app or not in_root:
+            return None
+        return ";".join(reversed(frames))
+
+    def folded(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
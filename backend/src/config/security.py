@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Protocol
+import hashlib
+import time
+
+
+# Интерфейс хранилища для ограничителя запросов (можно подменить, например, на Redis)
+class RateLimitBackend(Protocol):
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Списывает один токен из ведра key.
+
+        Возвращает 0, если токен списан, иначе количество секунд
+        до появления следующего токена.
+        """
+        ...
+
+
+# Хранилище ведер в памяти процесса
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            # Вытесняем самые давно не использованные ведра
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+# Ограничитель запросов по алгоритму token bucket
+class RateLimiter:
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    def hit(self, key: str) -> float:
+        # Хэшируем ключ, чтобы размер хранилища не зависел от пользовательского ввода
+        key = hashlib.sha256(key.encode()).hexdigest()
+        return self.backend.consume(key, self.capacity, self.refill_rate)
+
+
+# LRU-кэш проверенных JWT-токенов: sha256(токен) -> claims
+class TokenCache:
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            payload = self._items.get(key)
+            if payload is None:
+                return None
+            # Токен с истекшим сроком удаляем из кэша
+            if payload.get("exp", 0) <= time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        # Токены без срока действия не кэшируем
+        if "exp" not in payload:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._items[key] = payload
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.routes import auth, orders, products
+from src.routes import auth, orders, products, profiling
 
 app = FastAPI(
     title="Plasto Orders API",
@@ -14,6 +14,15 @@ app.include_router(orders.router, prefix="/api/orders", tags=["orders"])
 app.include_router(products.router, prefix="/api/products", tags=["products"])
 
 
+# Окно сэмплирования доступно суперпользователям всегда: в простое поток профилировщика
+# не запущен, поэтому включить профилирование можно без перезапуска сервиса
+app.include_router(profiling.router, prefix="/api/profiling", tags=["profiling"])
+
+
+# Профилирование отдельного запроса по заголовку X-Profile (только для суперпользователей)
+app.add_middleware(profiling.ProfileRequestMiddleware)
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost"],
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import ENUM
 import enum
@@ -30,10 +30,11 @@ class TelegramOrder(Base):
     payment_amount = Column(Numeric(15, 2), nullable=False)
     account_number = Column(String(20), nullable=False)
     contractor_name = Column(String(255), nullable=False)
-    manager_name = Column(String(70), nullable=True)
+    manager_name = Column(String(70), nullable=True, index=True)
     order_status = Column(
         ENUM(*OrderStatus.get_values(), name="orderstatus"),
         nullable=False,
+        index=True,
         default="Заказ оплачен",
     )
     highlight_color = Column(String(10), nullable=False, default="red")
@@ -46,7 +47,9 @@ class TelegramOrderItem(Base):
     __table_args__ = {"schema": "telegram"}
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("telegram.orders.id"), nullable=False)
+    order_id = Column(
+        Integer, ForeignKey("telegram.orders.id"), nullable=False, index=True
+    )
     product_name = Column(String(100), nullable=False)
     quantity = Column(Integer, nullable=False)
 
@@ -60,8 +63,12 @@ class ManualOrder(Base):
     created_at = Column(Date, nullable=False)
     organization = Column(String(255), nullable=False)
     invoice_number = Column(String(20), nullable=False)
-    manager = Column(String(70), nullable=False)
-    status = Column(ENUM(*OrderStatus.get_values(), name="orderstatus"), nullable=False)
+    manager = Column(String(70), nullable=False, index=True)
+    status = Column(
+        ENUM(*OrderStatus.get_values(), name="orderstatus"),
+        nullable=False,
+        index=True,
+    )
     closed_at = Column(Date, nullable=True)
     source = Column(String(20), nullable=False, default="manual")
 
@@ -72,7 +79,9 @@ class ManualOrderItem(Base):
     __table_args__ = {"schema": "app"}
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("app.manual_orders.id"), nullable=False)
+    order_id = Column(
+        Integer, ForeignKey("app.manual_orders.id"), nullable=False, index=True
+    )
     product_name = Column(String(100), nullable=False)
     quantity = Column(Integer, nullable=False)
 
@@ -80,11 +89,23 @@ class ManualOrderItem(Base):
 # Модель для app.products
 class Product(Base):
     __tablename__ = "products"
-    __table_args__ = {"schema": "app"}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True)
 
+    # Индексы для поиска товара по названию без учёта регистра:
+    # btree — для точного совпадения, триграммный GIN — для LIKE '%...%'
+    __table_args__ = (
+        Index("ix_app_products_name_lower", func.lower(name)),
+        Index(
+            "ix_app_products_name_trgm",
+            func.lower(name).label("name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"name_lower": "gin_trgm_ops"},
+        ),
+        {"schema": "app"},
+    )
+
 
 # Модель для auth.managers
 class Manager(Base):
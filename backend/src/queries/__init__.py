@@ -0,0 +1,33 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+from src.models import Manager, Product
+
+
+# Запросы с часто используемыми фильтрами. Маршруты строят их только через эти
+# функции, а tests/test_query_plans.py проверяет их планы (EXPLAIN) на индексы
+
+
+# Заказ по id (TelegramOrder или ManualOrder)
+def order_by_id(db: Session, order_model, order_id: int) -> Query:
+    return db.query(order_model).filter(order_model.id == order_id)
+
+
+# Позиции заказа (TelegramOrderItem или ManualOrderItem)
+def order_items(db: Session, item_model, order_id: int) -> Query:
+    return db.query(item_model).filter(item_model.order_id == order_id)
+
+
+# Продукт по точному названию без учёта регистра
+def product_by_name(db: Session, name: str) -> Query:
+    return db.query(Product).filter(func.lower(Product.name) == func.lower(name))
+
+
+# Продукты по частичному совпадению названия без учёта регистра
+def products_search(db: Session, query: str) -> Query:
+    return db.query(Product).filter(
+        func.lower(Product.name).like(f"%{query.lower()}%"))
+
+
+# Менеджер по имени пользователя
+def manager_by_username(db: Session, username: str) -> Query:
+    return db.query(Manager).filter(Manager.username == username)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from src.models import Manager
 from src.config.database import get_db
 from src.schemas import LoginRequest, SuperuserStatusUpdate
 from src.config import logger
+from src.config.security import RateLimiter, TokenCache
+from src import queries
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone, date
 from typing import Optional
@@ -25,6 +26,31 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
+# Настройки ограничения попыток логина (token bucket)
+LOGIN_RATE_LIMIT_CAPACITY = int(os.getenv("LOGIN_RATE_LIMIT_CAPACITY", "5"))
+LOGIN_RATE_LIMIT_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_PER_MINUTE", "5"))
+LOGIN_IP_RATE_LIMIT_CAPACITY = int(os.getenv("LOGIN_IP_RATE_LIMIT_CAPACITY", "20"))
+LOGIN_IP_RATE_LIMIT_PER_MINUTE = float(
+    os.getenv("LOGIN_IP_RATE_LIMIT_PER_MINUTE", "20"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+
+# Ограничители попыток логина по паре (имя пользователя, IP клиента) и по IP клиента.
+# Имя учитывается вместе с IP, чтобы чужие попытки не блокировали вход менеджеру
+login_username_limiter = RateLimiter(
+    capacity=LOGIN_RATE_LIMIT_CAPACITY,
+    refill_rate=LOGIN_RATE_LIMIT_PER_MINUTE / 60,
+)
+login_ip_limiter = RateLimiter(
+    capacity=LOGIN_IP_RATE_LIMIT_CAPACITY,
+    refill_rate=LOGIN_IP_RATE_LIMIT_PER_MINUTE / 60,
+)
+
+
+# Кэш проверенных токенов, чтобы не вызывать jwt.decode на каждый запрос
+token_cache = TokenCache(max_size=TOKEN_CACHE_SIZE)
+
+
 # Настройка хэширования паролей
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -60,13 +86,16 @@ async def get_current_manager(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            token_cache.set(token, payload)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
-    manager = db.query(Manager).filter(Manager.username == username).first()
+    manager = queries.manager_by_username(db, username).first()
     if manager is None:
         raise credentials_exception
     # Проверяем срок действия суперюзера
@@ -95,9 +124,28 @@ async def get_current_superuser(current_manager: dict = Depends(get_current_mana
 
 # Эндпоинт для логина
 @router.post("/login")
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
-    manager = db.query(Manager).filter(
-        Manager.username == request.username).first()
+async def login(
+    request: LoginRequest, http_request: Request, db: Session = Depends(get_db)
+):
+    # Ограничиваем частоту попыток до обращения к БД и bcrypt.
+    # За nginx client.host — реальный IP клиента, только если uvicorn доверяет прокси
+    # (--proxy-headers и FORWARDED_ALLOW_IPS, см. docker-compose.yml),
+    # иначе все пользователи попадут в одно ведро с адресом nginx
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    retry_after = max(
+        login_ip_limiter.hit(f"ip:{client_ip}"),
+        login_username_limiter.hit(
+            f"user:{request.username.lower()}:ip:{client_ip}"),
+    )
+    if retry_after:
+        logger.info(
+            f"Превышен лимит попыток входа для {request.username} с адреса {client_ip}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+    manager = queries.manager_by_username(db, request.username).first()
     if not manager or not verify_password(request.password, manager.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -121,8 +169,8 @@ async def grant_superuser_status(
     current_manager: dict = Depends(get_current_manager)
 ):
     # Проверяем, является ли текущий менеджер суперпользователем
-    current_manager_record = db.query(Manager).filter(
-        Manager.username == current_manager["username"]).first()
+    current_manager_record = queries.manager_by_username(
+        db, current_manager["username"]).first()
     if not current_manager_record:
         raise HTTPException(
             status_code=404, detail="Current manager not found")
@@ -133,8 +181,7 @@ async def grant_superuser_status(
             status_code=403, detail="Only superusers can grant superuser status")
 
     # Проверяем, существует ли целевой пользователь
-    target_manager = db.query(Manager).filter(
-        Manager.username == username).first()
+    target_manager = queries.manager_by_username(db, username).first()
     if not target_manager:
         raise HTTPException(status_code=404, detail="Target manager not found")
 
@@ -1,40 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from src.models import (
     TelegramOrder,
     TelegramOrderItem,
     ManualOrder,
     ManualOrderItem,
-    Product,
-    Manager,
 )
-from src.config.database import get_db
+from src.config.database import (
+    get_write_db,
+    reads_from_primary,
+    run_with_read_session,
+)
 from src.config import logger
+from src import queries
+from src.config.cache import SingleFlightCache, RESPONSE_CACHE_TTL_SECONDS
 from src.schemas import OrderUpdate, OrderResponse, OrderCreate
 from src.routes.auth import get_current_manager
 from datetime import date
-from sqlalchemy import func
+from pydantic import TypeAdapter
 from typing import List
 
 
 router = APIRouter()
 
 
+# Общий кэш списка заказов: одновременные запросы разделяют один запрос к БД
+orders_cache = SingleFlightCache(ttl=RESPONSE_CACHE_TTL_SECONDS)
+orders_adapter = TypeAdapter(List[OrderResponse])
+
+
 # Объединение заказов из telegram и app
 @router.get("/", response_model=List[OrderResponse])
 async def get_orders(
-    db: Session = Depends(get_db), current_manager: dict = Depends(get_current_manager)
+    request: Request, current_manager: dict = Depends(get_current_manager)
 ):
+    if reads_from_primary(request):
+        # Клиент недавно изменял заказы: читаем из основной базы в обход общего кэша
+        body = await run_in_threadpool(run_with_read_session, _load_orders, True)
+    else:
+        # Общее вычисление открывает свою сессию и не зависит от запроса, который его начал
+        body = await orders_cache.get_or_compute(
+            "orders", lambda: run_with_read_session(_load_orders))
+    return Response(content=body, media_type="application/json")
+
+
+# Загрузка всех заказов и сериализация в JSON
+def _load_orders(db: Session) -> bytes:
     telegram_orders = db.query(TelegramOrder).all()
     manual_orders = db.query(ManualOrder).all()
 
     orders = []
     for order in telegram_orders:
-        items = (
-            db.query(TelegramOrderItem)
-            .filter(TelegramOrderItem.order_id == order.id)
-            .all()
-        )
+        items = queries.order_items(db, TelegramOrderItem, order.id).all()
         content = [{"product_name": item.product_name, "quantity": item.quantity}
                    for item in items] if items else []
         orders.append(
@@ -52,10 +70,7 @@ async def get_orders(
         )
 
     for order in manual_orders:
-        items = (
-            db.query(ManualOrderItem).filter(
-                ManualOrderItem.order_id == order.id).all()
-        )
+        items = queries.order_items(db, ManualOrderItem, order.id).all()
         content = (
             [
                 {"product_name": item.product_name, "quantity": item.quantity}
@@ -78,7 +93,7 @@ async def get_orders(
             }
         )
 
-    return orders
+    return orders_adapter.dump_json(orders_adapter.validate_python(orders))
 
 
 # Обновление заказа
@@ -86,15 +101,12 @@ async def get_orders(
 async def update_order(
     order_id: int,
     update_data: OrderUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_manager: dict = Depends(get_current_manager),
 ):
     # Определяем источник заказа
-    telegram_order = (
-        db.query(TelegramOrder).filter(TelegramOrder.id == order_id).first()
-    )
-    manual_order = db.query(ManualOrder).filter(
-        ManualOrder.id == order_id).first()
+    telegram_order = queries.order_by_id(db, TelegramOrder, order_id).first()
+    manual_order = queries.order_by_id(db, ManualOrder, order_id).first()
 
     if not telegram_order and not manual_order:
         raise HTTPException(status_code=404, detail="Заказ не найден")
@@ -106,8 +118,7 @@ async def update_order(
     manager = current_manager["username"]
     order_manager = getattr(
         order, "manager_name" if telegram_order else "manager")
-    manager_record = db.query(Manager).filter(
-        Manager.username == manager).first()
+    manager_record = queries.manager_by_username(db, manager).first()
     is_superuser = (
         manager_record
         and manager_record.superuser_expiry
@@ -155,14 +166,10 @@ async def update_order(
         logger.info(f"Мэнагер {manager} изменяет содержимое заказа {order_id}")
 
         # Удаляем старые записи
-        db.query(item_model).filter(item_model.order_id == order_id).delete()
+        queries.order_items(db, item_model, order_id).delete()
         # Проверяем и добавляем новые продукты
         for item in update_data.content:
-            product = (
-                db.query(Product)
-                .filter(func.lower(Product.name) == func.lower(item.product_name))
-                .first()
-            )
+            product = queries.product_by_name(db, item.product_name).first()
             if not product:
                 raise HTTPException(
                     status_code=404,
@@ -180,10 +187,11 @@ async def update_order(
             db.add(new_item)
 
     db.commit()
+    orders_cache.invalidate()
     db.refresh(order)
 
     # Получаем обновлённые данные
-    items = db.query(item_model).filter(item_model.order_id == order_id).all()
+    items = queries.order_items(db, item_model, order_id).all()
     content = (
         [
             {"product_name": item.product_name, "quantity": item.quantity}
@@ -222,17 +230,13 @@ async def update_order(
 @router.post("/", response_model=OrderResponse)
 async def create_order(
     order_data: OrderCreate = Body(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_manager: dict = Depends(get_current_manager),
 ):
     # Проверка наличия продуктов и валидация количества
     if order_data.content:
         for item in order_data.content:
-            product = (
-                db.query(Product)
-                .filter(func.lower(Product.name) == func.lower(item.product_name))
-                .first()
-            )
+            product = queries.product_by_name(db, item.product_name).first()
             if not product:
                 raise HTTPException(
                     status_code=400, detail=f"Product '{item.product_name}' not found"
@@ -271,13 +275,11 @@ async def create_order(
             db.add(new_item)
 
     db.commit()
+    orders_cache.invalidate()
     db.refresh(new_order)
 
     # Получаем элементы заказа
-    items = (
-        db.query(ManualOrderItem).filter(
-            ManualOrderItem.order_id == new_order.id).all()
-    )
+    items = queries.order_items(db, ManualOrderItem, new_order.id).all()
     content = (
         [
             {"product_name": item.product_name, "quantity": item.quantity}
@@ -305,15 +307,12 @@ async def create_order(
 @router.delete("/{order_id}", status_code=204)
 async def delete_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_manager: dict = Depends(get_current_manager),
 ):
     # Определяем источник заказа
-    telegram_order = (
-        db.query(TelegramOrder).filter(TelegramOrder.id == order_id).first()
-    )
-    manual_order = db.query(ManualOrder).filter(
-        ManualOrder.id == order_id).first()
+    telegram_order = queries.order_by_id(db, TelegramOrder, order_id).first()
+    manual_order = queries.order_by_id(db, ManualOrder, order_id).first()
 
     if not telegram_order and not manual_order:
         raise HTTPException(status_code=404, detail="Заказ не найден")
@@ -325,8 +324,7 @@ async def delete_order(
     manager = current_manager["username"]
     order_manager = getattr(
         order, "manager_name" if telegram_order else "manager")
-    manager_record = db.query(Manager).filter(
-        Manager.username == manager).first()
+    manager_record = queries.manager_by_username(db, manager).first()
     is_superuser = (
         manager_record
         and manager_record.superuser_expiry
@@ -339,11 +337,12 @@ async def delete_order(
     logger.info(f"Мэнагер {manager} начал удаление заказа {order_id}")
 
     # Удаляем связанные элементы
-    db.query(item_model).filter(item_model.order_id == order_id).delete()
+    queries.order_items(db, item_model, order_id).delete()
 
     # Удаляем сам заказ
     db.delete(order)
     db.commit()
+    orders_cache.invalidate()
 
     logger.info(f"Мэнагер {manager} успешно удалил заказ {order_id}")
 
@@ -1,27 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from src.models import Product
-from src.config.database import get_db
-from sqlalchemy import func
+from src.config.database import get_read_db, run_with_read_session
+from src.config.cache import SingleFlightCache, RESPONSE_CACHE_TTL_SECONDS
+from src import queries
+import json
 
 router = APIRouter()
 
 
+# Общий кэш списка продуктов: одновременные запросы разделяют один запрос к БД
+products_cache = SingleFlightCache(ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+
 # Эндпоинт для получения списка всех продуктов
 @router.get("/")
-async def get_products(db: Session = Depends(get_db)):
+async def get_products():
+    # Общее вычисление открывает свою сессию и не зависит от запроса, который его начал
+    body = await products_cache.get_or_compute(
+        "products", lambda: run_with_read_session(_load_products))
+    return Response(content=body, media_type="application/json")
+
+
+# Загрузка всех продуктов и сериализация в JSON
+def _load_products(db: Session) -> bytes:
     products = db.query(Product).all()
-    return [{"id": p.id, "name": p.name} for p in products]
+    return json.dumps(
+        [{"id": p.id, "name": p.name} for p in products], ensure_ascii=False
+    ).encode()
 
 
 # Эндпоинт для поиска продуктов по частичному совпадению (без учёта регистра)
 @router.get("/search")
-async def search_products(query: str, db: Session = Depends(get_db)):
-    products = (
-        db.query(Product)
-        .filter(func.lower(Product.name).like(f"%{query.lower()}%"))
-        .all()
-    )
+async def search_products(query: str, db: Session = Depends(get_read_db)):
+    products = queries.products_search(db, query).all()
     if not products:
         raise HTTPException(status_code=404, detail="No products found")
     return [{"id": p.id, "name": p.name} for p in products]
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from src.config import logger, database
+from src.config.profiling import StackSampler, PROFILING_MAX_WINDOW_SECONDS
+from src.routes import auth
+from src.routes.auth import get_current_superuser
+import asyncio
+import sys
+
+
+router = APIRouter()
+
+
+# Одновременно может работать только одно окно сэмплирования
+sampling_lock = asyncio.Lock()
+
+
+# Эндпоинт для сэмплирования стеков всего процесса в течение заданного окна
+@router.post("/sample", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = 10,
+    current_manager: dict = Depends(get_current_superuser),
+):
+    if seconds <= 0 or seconds > PROFILING_MAX_WINDOW_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Окно должно быть от 0 до {PROFILING_MAX_WINDOW_SECONDS} секунд",
+        )
+    if sampling_lock.locked():
+        raise HTTPException(
+            status_code=409, detail="Profiling window is already running")
+
+    async with sampling_lock:
+        logger.info(
+            f"Суперпользователь {current_manager['username']} запустил профилирование на {seconds} с")
+        with StackSampler() as sampler:
+            await asyncio.sleep(seconds)
+    return PlainTextResponse(sampler.folded())
+
+
+# Проверяет, что запрос пришёл от суперпользователя (по заголовку Authorization)
+async def _is_superuser(scope) -> bool:
+    headers = dict(scope["headers"])
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    db = database.SessionLocal()
+    try:
+        current_manager = await auth.get_current_manager(token, db)
+        await auth.get_current_superuser(current_manager)
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+    return True
+
+
+# Профилирование отдельного запроса по заголовку X-Profile (только для суперпользователей).
+# Чистый ASGI: без заголовка стоимость — одна проверка списка заголовков.
+# В профиль попадают только стеки, проходящие через кадр этого запроса, поэтому
+# параллельные запросы и общие вычисления в пуле потоков в него не смешиваются
+class ProfileRequestMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(
+            name == b"x-profile" for name, _ in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not await _is_superuser(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        # Ответ обработчика отбрасываем, вместо него возвращаем профиль
+        async def discard(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        with StackSampler(root_frame=sys._getframe()) as sampler:
+            await self.app(scope, receive, discard)
+        response = PlainTextResponse(
+            sampler.folded(),
+            headers={"X-Profile-Response-Status": str(status_code)},
+        )
+        await response(scope, receive, send)
@@ -1,10 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 
 # Модель для запроса логина
 class LoginRequest(BaseModel):
-    username: str
+    username: str = Field(max_length=70)
     password: str
 
 
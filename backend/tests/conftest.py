@@ -0,0 +1,11 @@
+import os
+import sys
+
+
+# Тесты запускаются из каталога backend: python -m pytest tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Значения по умолчанию, чтобы модули приложения импортировались без .env
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
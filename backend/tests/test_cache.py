@@ -0,0 +1,111 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from src.config import database
+from src.config.cache import SingleFlightCache
+from src.models import Product
+from src.routes import products
+import asyncio
+import json
+import threading
+import time
+
+
+def test_concurrent_requests_share_one_computation():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        cache = SingleFlightCache(ttl=60)
+        results = await asyncio.gather(
+            *[cache.get_or_compute("key", compute) for _ in range(50)])
+        cached = await cache.get_or_compute("key", compute)
+        return results, cached
+
+    results, cached = asyncio.run(main())
+    assert set(results) == {1}
+    assert cached == 1
+    assert len(calls) == 1
+
+
+def test_invalidate_drops_cached_and_inflight_values():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        value = len(calls)
+        time.sleep(0.05)
+        return value
+
+    async def main():
+        cache = SingleFlightCache(ttl=60)
+        stale = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.01)
+        cache.invalidate()
+        fresh = await cache.get_or_compute("key", compute)
+        return await stale, fresh, await cache.get_or_compute("key", compute)
+
+    stale, fresh, cached = asyncio.run(main())
+    assert (stale, fresh, cached) == (1, 2, 2)
+
+
+def test_cancelled_first_caller_does_not_cancel_others():
+    started = threading.Event()
+
+    def compute():
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    async def main():
+        cache = SingleFlightCache(ttl=60)
+        first = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "value"
+
+
+# Список продуктов считается в собственной сессии, одной на все одновременные запросы
+def test_products_are_loaded_once_in_own_session(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE '{tmp_path / 'app.db'}' AS app")
+
+    Product.__table__.create(engine)
+    with Session(engine) as db:
+        db.add_all([Product(id=1, name="Труба"), Product(id=2, name="Отвод")])
+        db.commit()
+
+    sessions = []
+    session_factory = database.sessionmaker(
+        class_=database.RoutingSession, bind=engine)
+
+    def counting_factory():
+        sessions.append(1)
+        return session_factory()
+
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", counting_factory)
+    monkeypatch.setattr(products, "products_cache", SingleFlightCache(ttl=60))
+
+    async def main():
+        return await asyncio.gather(
+            *[products.get_products() for _ in range(20)])
+
+    responses = asyncio.run(main())
+    assert len(sessions) == 1
+    assert {response.body for response in responses} == {responses[0].body}
+    assert json.loads(responses[0].body) == [
+        {"id": 1, "name": "Труба"}, {"id": 2, "name": "Отвод"}]
+    engine.dispose()
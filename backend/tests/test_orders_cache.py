@@ -0,0 +1,101 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from src.config import database
+from src.config.cache import SingleFlightCache
+from src.models import Base, Manager, Product
+from src.routes import orders
+from src.routes.auth import get_current_manager
+import pytest
+
+
+# База SQLite из нескольких файлов: схемы telegram, app и auth подключаются через ATTACH
+def sqlite_engine(directory):
+    directory.mkdir()
+    engine = create_engine(f"sqlite:///{directory / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schemas(dbapi_connection, connection_record):
+        for schema in ("telegram", "app", "auth"):
+            dbapi_connection.execute(
+                f"ATTACH DATABASE '{directory / schema}.db' AS {schema}")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([Product(id=1, name="Труба"), Manager(
+            username="manager", password_hash="x")])
+        db.commit()
+    return engine
+
+
+def use_databases(monkeypatch, primary, replica):
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(
+        database, "SessionLocal", database.sessionmaker(bind=primary))
+    monkeypatch.setattr(orders, "orders_cache", SingleFlightCache(ttl=60))
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(orders.router, prefix="/api/orders")
+    app.dependency_overrides[get_current_manager] = lambda: {
+        "username": "manager", "status": "regular"}
+    return app
+
+
+def new_order(organization):
+    return {
+        "organization": organization,
+        "invoice_number": "1",
+        "manager": "manager",
+        "content": [{"product_name": "Труба", "quantity": 1}],
+    }
+
+
+def organizations(client):
+    return [order["organization"] for order in client.get("/api/orders/").json()]
+
+
+# Каждая запись в orders.py сбрасывает закэшированный список заказов
+def test_order_writes_invalidate_cached_list(tmp_path, monkeypatch, app):
+    engine = sqlite_engine(tmp_path / "primary")
+    use_databases(monkeypatch, engine, engine)
+    client = TestClient(app)
+
+    assert organizations(client) == []
+    assert "orders" in orders.orders_cache._values
+
+    order_id = client.post("/api/orders/", json=new_order("ООО Альфа")).json()["id"]
+    assert organizations(client) == ["ООО Альфа"]
+
+    client.patch(f"/api/orders/{order_id}", json={"order_status": "Заказ в работе"})
+    assert [order["status"] for order in client.get("/api/orders/").json()] == [
+        "Заказ в работе"]
+
+    assert client.delete(f"/api/orders/{order_id}").status_code == 204
+    assert organizations(client) == []
+    engine.dispose()
+
+
+# Клиент с cookie read_primary читает из основной базы в обход общего кэша
+def test_writing_client_skips_shared_cache(tmp_path, monkeypatch, app):
+    primary = sqlite_engine(tmp_path / "primary")
+    replica = sqlite_engine(tmp_path / "replica")
+    use_databases(monkeypatch, primary, replica)
+    writer = TestClient(app)
+    other = TestClient(app)
+
+    writer.post("/api/orders/", json=new_order("ООО Альфа"))
+    assert database.PRIMARY_COOKIE in writer.cookies
+
+    assert organizations(writer) == ["ООО Альфа"]
+    assert "orders" not in orders.orders_cache._values
+    # Остальные клиенты читают из реплики через общий кэш
+    assert organizations(other) == []
+    assert "orders" in orders.orders_cache._values
+    assert organizations(writer) == ["ООО Альфа"]
+    primary.dispose()
+    replica.dispose()
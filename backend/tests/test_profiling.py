@@ -0,0 +1,132 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.config.profiling import StackSampler
+from src.main import app
+from src.routes import auth, profiling
+from src.routes.auth import get_current_manager
+from src.routes.orders import _load_orders
+import pytest
+import sys
+import threading
+import time
+
+
+REGULAR = {"username": "manager", "status": "regular"}
+SUPERUSER = {"username": "admin", "status": "superuser"}
+
+
+# Заглушка сессии: каждый запрос к БД занимает процессор на 50 мс
+class BusySession:
+    def query(self, model):
+        started = time.perf_counter()
+        while time.perf_counter() - started < 0.05:
+            pass
+        return self
+
+    def all(self):
+        return []
+
+
+@pytest.fixture
+def client():
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def as_manager(monkeypatch, manager):
+    async def current_manager(token, db):
+        return manager
+
+    app.dependency_overrides[get_current_manager] = lambda: manager
+    monkeypatch.setattr(auth, "get_current_manager", current_manager)
+
+
+def test_sampler_records_app_frames():
+    with StackSampler(interval=0.001) as sampler:
+        _load_orders(BusySession())
+    stacks = sampler.folded()
+    assert "_load_orders (src/routes/orders.py:" in stacks
+
+
+def test_fold_skips_stacks_outside_app():
+    assert StackSampler._fold(sys._getframe()) is None
+
+
+def test_fold_skips_stacks_outside_root_frame():
+    sampled = {}
+
+    def work():
+        sampled["frame"] = sys._getframe()
+
+    work()
+    assert StackSampler._fold(sampled["frame"], root_frame=object()) is None
+
+
+def test_sample_window_requires_superuser(client, monkeypatch):
+    as_manager(monkeypatch, REGULAR)
+    assert client.post("/api/profiling/sample?seconds=0.1").status_code == 403
+
+
+@pytest.mark.parametrize("seconds", [0, 1000])
+def test_sample_window_rejects_out_of_range_seconds(client, monkeypatch, seconds):
+    as_manager(monkeypatch, SUPERUSER)
+    response = client.post(f"/api/profiling/sample?seconds={seconds}")
+    assert response.status_code == 400
+
+
+def test_only_one_sample_window_at_a_time(client, monkeypatch):
+    as_manager(monkeypatch, SUPERUSER)
+    responses = {}
+
+    def first_window():
+        responses["first"] = client.post("/api/profiling/sample?seconds=0.5")
+
+    with client:
+        thread = threading.Thread(target=first_window)
+        thread.start()
+        time.sleep(0.2)
+        second = client.post("/api/profiling/sample?seconds=0.1")
+        thread.join()
+
+    assert second.status_code == 409
+    assert responses["first"].status_code == 200
+
+
+def test_x_profile_from_regular_manager_returns_normal_response(
+    client, monkeypatch
+):
+    as_manager(monkeypatch, REGULAR)
+    response = client.get(
+        "/", headers={"X-Profile": "1", "Authorization": "Bearer token"})
+    assert response.json() == {"message": "Welcome to Plasto Orders API"}
+
+
+# Профиль запроса содержит его обработчик и не содержит параллельные запросы
+def test_x_profile_returns_only_own_request_stacks(monkeypatch):
+    as_manager(monkeypatch, SUPERUSER)
+    profiled_app = FastAPI()
+    profiled_app.add_middleware(profiling.ProfileRequestMiddleware)
+
+    @profiled_app.get("/profiled")
+    async def profiled():
+        _load_orders(BusySession())
+        return {}
+
+    stop = threading.Event()
+
+    def background_load():
+        while not stop.is_set():
+            _load_orders(BusySession())
+
+    thread = threading.Thread(target=background_load)
+    thread.start()
+    try:
+        response = TestClient(profiled_app).get(
+            "/profiled", headers={"X-Profile": "1", "Authorization": "Bearer token"})
+    finally:
+        stop.set()
+        thread.join()
+
+    assert response.headers["X-Profile-Response-Status"] == "200"
+    assert "profiled (" in response.text
+    assert "background_load" not in response.text
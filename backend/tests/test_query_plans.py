@@ -0,0 +1,110 @@
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+from src import queries
+from src.models import (
+    Base,
+    TelegramOrder,
+    TelegramOrderItem,
+    ManualOrder,
+    ManualOrderItem,
+)
+import os
+import pytest
+
+
+# Проверка планов запросов требует PostgreSQL:
+# TEST_DATABASE_URL=postgresql://user@localhost/test python -m pytest tests
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = 50000
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+# Запросы с горячими предикатами строятся теми же функциями, что и в маршрутах
+HOT_QUERIES = {
+    "telegram_order_by_id": lambda db: queries.order_by_id(
+        db, TelegramOrder, 4242),
+    "manual_order_by_id": lambda db: queries.order_by_id(db, ManualOrder, 4242),
+    "telegram_order_items_by_order": lambda db: queries.order_items(
+        db, TelegramOrderItem, 4242),
+    "manual_order_items_by_order": lambda db: queries.order_items(
+        db, ManualOrderItem, 4242),
+    "product_by_name": lambda db: queries.product_by_name(db, "Товар 4242"),
+    "product_search": lambda db: queries.products_search(db, "товар 4242"),
+    "manager_by_username": lambda db: queries.manager_by_username(
+        db, "manager_4242"),
+}
+
+
+# Схемы и таблицы создаются без индексов, индексы добавляют миграции Alembic
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        for schema in ("telegram", "app", "auth"):
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        conn.execute(text("DROP TYPE IF EXISTS orderstatus CASCADE"))
+        TelegramOrder.__table__.c.order_status.type.create(conn)
+        for table in Base.metadata.sorted_tables:
+            conn.execute(CreateTable(table))
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option(
+        "script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option(
+        "sqlalchemy.url", TEST_DATABASE_URL.replace("%", "%%"))
+    command.upgrade(config, "head")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO telegram.orders (id, payment_date, payment_number,
+                payment_amount, account_number, contractor_name, manager_name,
+                order_status, highlight_color)
+            SELECT i, '2026-01-01', i, 100, i, 'ООО ' || i, 'manager_' || i % 50,
+                'Заказ оплачен', 'red'
+            FROM generate_series(1, {ROWS}) AS i;
+
+            INSERT INTO app.manual_orders (id, created_at, organization,
+                invoice_number, manager, status, source)
+            SELECT i, DATE '2026-01-01', 'ООО ' || i, i, 'manager_' || i % 50,
+                'Заказ в работе', 'manual'
+            FROM generate_series(1, {ROWS}) AS i;
+
+            INSERT INTO telegram.order_items (id, order_id, product_name, quantity)
+            SELECT i, i % {ROWS} + 1, 'Товар ' || i % 1000, 1
+            FROM generate_series(1, {ROWS * 3}) AS i;
+
+            INSERT INTO app.order_items (id, order_id, product_name, quantity)
+            SELECT i, i % {ROWS} + 1, 'Товар ' || i % 1000, 1
+            FROM generate_series(1, {ROWS * 3}) AS i;
+
+            INSERT INTO app.products (id, name)
+            SELECT i, 'Товар ' || i FROM generate_series(1, {ROWS}) AS i;
+
+            INSERT INTO auth.managers (username, password_hash, status)
+            SELECT 'manager_' || i, 'x', 'regular'
+            FROM generate_series(1, {ROWS}) AS i;
+        """))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(engine, name):
+    with Session(engine) as db:
+        statement = HOT_QUERIES[name](db).statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        plan = "\n".join(
+            row[0] for row in db.execute(text(f"EXPLAIN {statement}")))
+    assert "Seq Scan" not in plan, plan
@@ -0,0 +1,88 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from src.config import database
+import pytest
+
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String(20), nullable=False)
+
+
+# Основная база и реплика — два файла SQLite с разным содержимым
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, source in ((primary, "primary"), (replica, "replica")):
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            db.add(Item(id=1, source=source))
+            db.commit()
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(
+        database, "SessionLocal", database.sessionmaker(bind=primary))
+    yield
+    primary.dispose()
+    replica.dispose()
+
+
+def sources(db):
+    return sorted(item.source for item in db.query(Item).all())
+
+
+def test_reads_go_to_replica(databases):
+    with database.ReadSessionLocal() as db:
+        assert sources(db) == ["replica"]
+
+
+def test_session_sticks_to_primary_after_flush(databases):
+    with database.ReadSessionLocal() as db:
+        db.add(Item(id=2, source="primary"))
+        db.commit()
+        assert sources(db) == ["primary", "primary"]
+
+
+def test_session_sticks_to_primary_after_bulk_delete(databases):
+    with database.ReadSessionLocal() as db:
+        db.query(Item).filter(Item.id == 1).delete()
+        db.commit()
+        assert sources(db) == []
+
+
+def test_only_writing_client_reads_from_primary(databases):
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items(db: Session = Depends(database.get_read_db)):
+        return sources(db)
+
+    @app.post("/items")
+    def create_item(db: Session = Depends(database.get_write_db)):
+        db.add(Item(source="primary"))
+        db.commit()
+
+    writer = TestClient(app)
+    other = TestClient(app)
+
+    assert writer.get("/items").json() == ["replica"]
+    writer.post("/items")
+    assert database.PRIMARY_COOKIE in writer.cookies
+    assert writer.get("/items").json() == ["primary", "primary"]
+    # Другие клиенты продолжают читать из реплики
+    assert other.get("/items").json() == ["replica"]
+
+
+def test_plain_sessions_are_not_marked(databases):
+    with database.SessionLocal() as db:
+        db.add(Item(id=2, source="primary"))
+        db.commit()
+        assert "use_primary" not in db.info
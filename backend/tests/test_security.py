@@ -0,0 +1,111 @@
+from datetime import timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from src.config.security import RateLimiter, TokenCache
+from src.routes import auth
+import asyncio
+import time
+
+
+# Заглушка сессии: db.query(Manager).filter(...).first() возвращает менеджера
+class FakeSession:
+    def __init__(self, manager):
+        self.manager = manager
+
+    def query(self, model):
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def first(self):
+        return self.manager
+
+
+# Синтетическая атака: поток попыток на один логин с разных адресов
+def test_login_burst_lets_through_only_bucket_capacity():
+    username_limiter = RateLimiter(capacity=5, refill_rate=5 / 60)
+    ip_limiter = RateLimiter(capacity=20, refill_rate=20 / 60)
+    attempts = 10000
+
+    started = time.perf_counter()
+    allowed = 0
+    for i in range(attempts):
+        retry_after = max(
+            ip_limiter.hit(f"ip:10.0.{i // 256 % 256}.{i % 256}"),
+            username_limiter.hit("user:manager"),
+        )
+        if not retry_after:
+            allowed += 1
+    per_check = (time.perf_counter() - started) / attempts
+
+    assert allowed == 5
+    # Проверка лимита должна быть на порядки дешевле bcrypt (~100+ мс)
+    assert per_check < 0.001
+
+
+def test_rate_limiter_refills_over_time():
+    limiter = RateLimiter(capacity=1, refill_rate=100)
+    assert limiter.hit("user:a") == 0
+    assert limiter.hit("user:a") > 0
+    time.sleep(0.02)
+    assert limiter.hit("user:a") == 0
+
+
+def test_rate_limiter_stores_hashed_keys():
+    limiter = RateLimiter(capacity=1, refill_rate=1)
+    limiter.hit("user:" + "x" * 100000)
+    (key,) = limiter.backend._buckets
+    assert len(key) == 64
+
+
+def test_token_cache_drops_expired_tokens():
+    cache = TokenCache(max_size=2)
+    cache.set("fresh", {"sub": "a", "exp": time.time() + 60})
+    cache.set("expired", {"sub": "b", "exp": time.time() - 1})
+    cache.set("no-exp", {"sub": "c"})
+    assert cache.get("fresh")["sub"] == "a"
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+
+
+def test_cached_token_skips_jwt_decode(monkeypatch):
+    calls = []
+    decode = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    monkeypatch.setattr(auth, "token_cache", TokenCache())
+    token = auth.create_access_token(
+        {"sub": "manager", "status": "regular"}, timedelta(minutes=5))
+    db = FakeSession(SimpleNamespace(
+        username="manager", status="regular", superuser_expiry=None))
+
+    for _ in range(3):
+        current = asyncio.run(auth.get_current_manager(token, db))
+        assert current == {"username": "manager", "status": "regular"}
+    assert len(calls) == 1
+
+
+# Попытки с чужого адреса не блокируют вход менеджеру с его адреса
+def test_login_attempts_from_other_ip_do_not_lock_out_manager(monkeypatch):
+    monkeypatch.setattr(auth, "login_username_limiter", RateLimiter(
+        capacity=5, refill_rate=5 / 60))
+    monkeypatch.setattr(auth, "login_ip_limiter", RateLimiter(
+        capacity=20, refill_rate=20 / 60))
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    app.dependency_overrides[auth.get_db] = lambda: FakeSession(None)
+    body = {"username": "manager", "password": "wrong"}
+
+    attacker = TestClient(app, client=("203.0.113.5", 50000))
+    statuses = [attacker.post("/api/auth/login", json=body).status_code
+                for _ in range(6)]
+    assert statuses == [401] * 5 + [429]
+
+    manager = TestClient(app, client=("198.51.100.7", 50000))
+    assert manager.post("/api/auth/login", json=body).status_code == 401